@@ -0,0 +1,25 @@
+"""Optional AOT build for the backend.
+
+Compiling server.py with Cython trims interpreter overhead on the
+request-handling glue (JWT handling, dict shuffling, route bodies) without
+any source changes. Build it in the Docker image with:
+
+    python setup.py build_ext --inplace
+
+The resulting server.*.so shadows server.py at import time; delete it to
+fall back to the interpreted module. Plain `uvicorn server:app` works either
+way, so this step is entirely optional for development.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="novazone-backend",
+    ext_modules=cythonize(
+        ["server.py"],
+        language_level=3,
+        # Pydantic/msgspec annotations are for validation, not C typing —
+        # don't let Cython reinterpret them
+        compiler_directives={"annotation_typing": False},
+    ),
+)
@@ -2,23 +2,233 @@
 """
 Comprehensive Backend API Testing for NovaZone Educational Platform
 Tests all authentication, dashboard, course, teacher, progress, quiz, community, and file endpoints
+
+Like the backend (see backend/setup.py), the harness can optionally be
+AOT-compiled to shave interpreter overhead off the per-call glue:
+
+    cythonize -3 -i backend_test.py
+
+The resulting .so shadows this file at import time; delete it to fall back
+to the interpreted module. Annotations on the hot paths are kept tight so
+compilation has something to work with.
 """
 
-import requests
-import json
-import base64
-import time
-from datetime import datetime
-from typing import Dict, Any, Optional
+import asyncio
+import hashlib
+import httpx
+import logging
+import os
+import sys
+import io
+import orjson
+import socket
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable
 
 # Configuration
 BASE_URL = "https://995d213b-3c3a-4487-a43f-18261ca54f2c.preview.emergentagent.com/api"
 HEADERS = {"Content-Type": "application/json"}
 
+# Results go through a severity-filtered logger: passes at INFO, failures
+# at ERROR, so CI can silence everything but failures with
+# NOVAZONE_LOG=ERROR. %-style arguments keep formatting deferred until a
+# record is actually emitted.
+logging.basicConfig(level=os.environ.get("NOVAZONE_LOG", "INFO").upper(), format="%(message)s")
+logger = logging.getLogger("novazone.test")
+
+# Transient gateway errors from the preview host are retried with backoff
+# instead of failing whole test categories
+RETRY_STATUSES = frozenset({502, 503, 504})
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 0.2
+
+# Resolve each host once per process instead of once per new connection —
+# the preview hostname never changes mid-run, so when the pool churns the
+# reconnect skips the getaddrinfo round trip. TLS still handshakes against
+# the hostname, so SNI and certificate checks are unaffected.
+_getaddrinfo = socket.getaddrinfo
+
+
+@lru_cache(maxsize=64)
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    return _getaddrinfo(host, port, family, type, proto, flags)
+
+
+socket.getaddrinfo = _cached_getaddrinfo
+
+# Static request payloads, serialized to wire bytes once at import time —
+# tests send the frozen bytes instead of rebuilding and re-encoding the same
+# dicts on every run. Payloads with dynamic fields (emails, ids) keep using
+# the dict path.
+PAYLOAD_COURSE_CREATE = orjson.dumps({
+    "title": "Advanced JavaScript Concepts",
+    "description": "Deep dive into modern JavaScript features and patterns",
+    "subject": "Programming",
+    "difficulty_level": "advanced",
+    "duration_hours": 35,
+    "total_lessons": 15
+})
+
+PAYLOAD_TEACHER_PROFILE = orjson.dumps({
+    "subjects": ["Programming", "Web Development", "JavaScript"],
+    "experience_years": 8,
+    "bio": "Experienced full-stack developer and educator",
+    "hourly_rate": 65.0
+})
+
+PAYLOAD_COMMUNITY_POST = orjson.dumps({
+    "title": "How to improve coding skills?",
+    "content": "I'm looking for advice on how to become a better programmer. Any tips?",
+    "category": "question"
+})
+
+PAYLOAD_FORBIDDEN_COURSE = orjson.dumps({
+    "title": "Unauthorized Course",
+    "description": "This should fail",
+    "subject": "Test",
+    "difficulty_level": "beginner",
+    "duration_hours": 10,
+    "total_lessons": 5
+})
+
+PAYLOAD_FORBIDDEN_PROFILE = orjson.dumps({
+    "subjects": ["Hacking"],
+    "experience_years": 1,
+    "bio": "Unauthorized access"
+})
+
+# Student-as-teacher attempts that must all be rejected with 403; a new
+# forbidden-path assertion is one line here
+FORBIDDEN_MATRIX = [
+    ("POST", "/courses", PAYLOAD_FORBIDDEN_COURSE),
+    ("PUT", "/teachers/profile", PAYLOAD_FORBIDDEN_PROFILE),
+]
+
+
+@dataclass(frozen=True)
+class TestSpec:
+    """One declarative test: request shape in, success predicate out.
+
+    Tests that are just "build request → call → check a key → log" live in
+    the spec tables below and run through _run_spec; only genuinely stateful
+    flows (bootstrap, login, uploads, RBAC) keep dedicated methods.
+    """
+    name: str
+    method: str
+    path: Callable                # tester -> endpoint string
+    check: Callable               # response dict -> bool
+    body: Callable = None         # tester -> dict, for dynamic payloads
+    raw_body: bytes = None        # frozen wire bytes for static payloads
+    auth: str = None              # "student" | "teacher", resolved to a token
+    needs: tuple = ()             # tester attributes that must be truthy
+    capture: Callable = None      # (tester, response) -> None, stash ids
+    detail: Callable = None       # response dict -> success log line
+
+
+# Read-only specs with no data dependency on each other — fanned out
+# concurrently so the cohort's wall time is max(RTT) instead of sum(RTT)
+INDEP_READS = [
+    TestSpec("Get Current User", "GET", lambda s: "/auth/me",
+             lambda d: "id" in d, auth="student", needs=("student_token",),
+             detail=lambda d: f"User data retrieved: {d['full_name']}"),
+    TestSpec("Student Dashboard", "GET", lambda s: f"/dashboard/student/{s.student_id}",
+             lambda d: "learning_path" in d, needs=("student_id",),
+             detail=lambda d: "Dashboard data includes learning path, courses, progress"),
+    TestSpec("Teacher Dashboard", "GET", lambda s: f"/dashboard/teacher/{s.teacher_id}",
+             lambda d: "analytics" in d, needs=("teacher_id",),
+             detail=lambda d: "Dashboard includes analytics and courses"),
+    TestSpec("Course Listing", "GET", lambda s: "/courses",
+             lambda d: isinstance(d, list),
+             detail=lambda d: f"Retrieved {len(d)} courses"),
+    TestSpec("Course Filtering", "GET", lambda s: "/courses?subject=Programming&difficulty=beginner",
+             lambda d: isinstance(d, list),
+             detail=lambda d: "Filtered courses retrieved"),
+    TestSpec("Teacher Listing", "GET", lambda s: "/teachers",
+             lambda d: isinstance(d, list),
+             detail=lambda d: f"Retrieved {len(d)} teachers"),
+    TestSpec("Teacher Subject Filtering", "GET", lambda s: "/teachers?subject=Programming",
+             lambda d: isinstance(d, list),
+             detail=lambda d: "Filtered teachers retrieved"),
+    TestSpec("Community Posts Listing", "GET", lambda s: "/community/posts",
+             lambda d: isinstance(d, list),
+             detail=lambda d: f"Retrieved {len(d)} posts"),
+    TestSpec("Community Posts Filtering", "GET", lambda s: "/community/posts?category=question",
+             lambda d: isinstance(d, list),
+             detail=lambda d: "Filtered posts retrieved"),
+    TestSpec("Get Student Progress", "GET", lambda s: f"/progress/{s.student_id}",
+             lambda d: "stats" in d, needs=("student_id",),
+             capture=lambda s, d: setattr(s, "_progress_cache", d),
+             detail=lambda d: "Progress data with AI analysis retrieved"),
+]
+
+# Write-path specs with create -> use ordering; run sequentially
+SEQ_CREATES = [
+    TestSpec("Course Creation", "POST", lambda s: "/courses",
+             lambda d: "id" in d, raw_body=PAYLOAD_COURSE_CREATE,
+             auth="teacher", needs=("teacher_token",),
+             capture=lambda s, d: setattr(s, "course_id", d["id"]),
+             detail=lambda d: f"Course created with ID: {d['id']}"),
+    TestSpec("Course Enrollment", "POST", lambda s: f"/courses/{s.course_id}/enroll",
+             lambda d: "message" in d, auth="student",
+             needs=("student_token", "course_id"),
+             # Enrolling creates the student's first progress record, so the
+             # payload cached by the earlier progress GET is now stale
+             capture=lambda s, d: setattr(s, "_progress_cache", None),
+             detail=lambda d: "Successfully enrolled in course"),
+    TestSpec("Teacher Recommendations", "GET", lambda s: "/teachers/recommendations/Programming",
+             lambda d: "recommendations" in d, auth="student", needs=("student_token",),
+             detail=lambda d: "AI recommendations retrieved"),
+    TestSpec("Teacher Profile Update", "PUT", lambda s: "/teachers/profile",
+             lambda d: "message" in d, raw_body=PAYLOAD_TEACHER_PROFILE,
+             auth="teacher", needs=("teacher_token",),
+             detail=lambda d: "Profile updated successfully"),
+]
+
+# Quiz flow (get -> submit) plus the community post create
+SEQ_QUIZ_COMMUNITY = [
+    TestSpec("Quiz Retrieval", "GET", lambda s: f"/quiz/{s.course_id or 'course_1'}",
+             lambda d: "questions" in d,
+             capture=lambda s, d: setattr(s, "quiz_id", d["id"]),
+             detail=lambda d: f"Quiz with {len(d['questions'])} questions retrieved"),
+    TestSpec("Quiz Submission", "POST", lambda s: "/quiz/submit",
+             lambda d: "score" in d, auth="student",
+             body=lambda s: {"quiz_id": s.quiz_id, "answers": [1, 2]},
+             needs=("quiz_id", "student_token"),
+             detail=lambda d: f"Quiz scored: {d['score']}%"),
+    TestSpec("Community Post Creation", "POST", lambda s: "/community/posts",
+             lambda d: "id" in d, raw_body=PAYLOAD_COMMUNITY_POST,
+             auth="student", needs=("student_token",),
+             capture=lambda s, d: setattr(s, "post_id", d["id"]),
+             detail=lambda d: f"Post created with ID: {d['id']}"),
+]
+
+
 class NovaZoneAPITester:
-    def __init__(self):
+    def __init__(self, stream: bool = False):
         self.base_url = BASE_URL
         self.headers = HEADERS.copy()
+        # Results are buffered as raw tuples and emitted through the
+        # level-filtered logger after the concurrent sections, so log
+        # formatting and emission never serialize the test cohort.
+        # stream=True (--stream on the CLI) reverts to immediate emission.
+        self.stream_logs = stream
+        self._log_buffer = []
+        # One async client for the whole run — HTTP/2 multiplexes all in-flight
+        # requests over a single TCP+TLS connection, so concurrent tests share
+        # one handshake. Auth headers stay per-call so tokens never leak
+        # across tests.
+        limits = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        try:
+            # retries=2 covers connection-level failures (resets, refused)
+            # inside the transport, reusing the pool instead of re-handshaking
+            transport = httpx.AsyncHTTPTransport(retries=2, http2=True, limits=limits)
+            self.client = httpx.AsyncClient(transport=transport, timeout=10.0)
+        except ImportError:
+            # h2 extra not installed — HTTP/1.1 keep-alive still pools fine
+            transport = httpx.AsyncHTTPTransport(retries=2, limits=limits)
+            self.client = httpx.AsyncClient(transport=transport, timeout=10.0)
+        self._headers_by_token = {}
         self.student_token = None
         self.teacher_token = None
         self.student_id = None
@@ -28,55 +238,159 @@ class NovaZoneAPITester:
         self.quiz_id = None
         self.post_id = None
         self.file_id = None
+        self._progress_cache = None
+        self._upload_sha256 = None
+        self._upload_size = 0
+        
+    def log_test(self, test_name: str, success: bool, details: str = "") -> None:
+        """Log a test result — buffered by default, printed only on flush"""
+        self._log_buffer.append((test_name, success, details))
+        if self.stream_logs:
+            self._write_entries(self._log_buffer[-1:])
+
+    def flush_logs(self) -> None:
+        """Emit all buffered results through the logger in one pass"""
+        if not self.stream_logs:
+            self._write_entries(self._log_buffer)
+        self._log_buffer.clear()
+
+    @staticmethod
+    def _write_entries(entries: list) -> None:
+        for test_name, success, details in entries:
+            level = logging.INFO if success else logging.ERROR
+            if not logger.isEnabledFor(level):
+                continue
+            if details:
+                logger.log(level, "%s %s\n   Details: %s\n",
+                           "✅ PASS" if success else "❌ FAIL", test_name, details)
+            else:
+                logger.log(level, "%s %s\n",
+                           "✅ PASS" if success else "❌ FAIL", test_name)
         
-    def log_test(self, test_name: str, success: bool, details: str = ""):
-        """Log test results"""
-        status = "✅ PASS" if success else "❌ FAIL"
-        print(f"{status} {test_name}")
-        if details:
-            print(f"   Details: {details}")
-        print()
-        
-    def make_request(self, method: str, endpoint: str, data: Dict = None, files: Dict = None, auth_token: str = None) -> tuple:
+    async def make_request(self, method: str, endpoint: str, data: dict = None, files: dict = None, auth_token: str = None, raw_body: bytes = None) -> tuple[bool, Any, int]:
         """Make HTTP request and return (success, response_data, status_code)"""
         url = f"{self.base_url}{endpoint}"
-        headers = self.headers.copy()
-        
+
+        # Header dicts are cached per token — no copy + insert on every call
         if auth_token:
-            headers["Authorization"] = f"Bearer {auth_token}"
-            
+            headers = self._headers_by_token.get(auth_token)
+            if headers is None:
+                headers = {**HEADERS, "Authorization": f"Bearer {auth_token}"}
+                self._headers_by_token[auth_token] = headers
+        else:
+            headers = self.headers
+
+        # Build kwargs once and dispatch through a single request() call —
+        # no per-verb branching in the hot path
+        kwargs = {"headers": headers}
+        if files:
+            # Copy before dropping content-type for uploads — the cached
+            # header dicts must never be mutated
+            kwargs["headers"] = {k: v for k, v in headers.items() if k != "Content-Type"}
+            kwargs["files"] = files
+        elif raw_body is not None:
+            kwargs["content"] = raw_body
+        elif data is not None:
+            # Pre-serialize to bytes so the body ships with an explicit
+            # Content-Length (single segment) instead of chunked encoding,
+            # and with orjson rather than the stdlib encoder
+            kwargs["content"] = orjson.dumps(data)
+
+        status_code = 0
         try:
-            if method == "GET":
-                response = requests.get(url, headers=headers)
-            elif method == "POST":
-                if files:
-                    # Remove content-type for file uploads
-                    headers.pop("Content-Type", None)
-                    response = requests.post(url, headers=headers, files=files)
-                else:
-                    response = requests.post(url, headers=headers, json=data)
-            elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers)
-            else:
-                return False, {"error": "Unsupported method"}, 400
-                
-            return response.status_code < 400, response.json() if response.content else {}, response.status_code
-            
-        except requests.exceptions.RequestException as e:
+            for attempt in range(RETRY_ATTEMPTS):
+                response = await self.client.request(method, url, **kwargs)
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                if attempt < RETRY_ATTEMPTS - 1:
+                    await asyncio.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+            status_code = response.status_code
+            # Fast path for bodiless acks — skip the body read and JSON
+            # parse entirely on 204s and explicit zero-length responses
+            if status_code == 204 or response.headers.get("Content-Length") == "0":
+                return status_code < 400, {}, status_code
+
+            # Parse once with orjson (C-level parser) and reuse the dict —
+            # response.json() would re-tokenize through the stdlib parser
+            body = orjson.loads(response.content) if response.content else {}
+            return status_code < 400, body, status_code
+
+        except httpx.HTTPError as e:
             return False, {"error": str(e)}, 0
-        except json.JSONDecodeError:
-            return False, {"error": "Invalid JSON response"}, response.status_code if 'response' in locals() else 0
+        except orjson.JSONDecodeError:
+            return False, {"error": "Invalid JSON response"}, status_code
+
+    async def _run_spec(self, spec: TestSpec) -> bool:
+        """Single driver loop for all table-driven tests"""
+        missing = [attr for attr in spec.needs if not getattr(self, attr)]
+        if missing:
+            self.log_test(spec.name, False, f"Missing prerequisite: {', '.join(missing)}")
+            return False
 
-    def test_seed_data(self):
+        success, data, status = await self.make_request(
+            spec.method,
+            spec.path(self),
+            data=spec.body(self) if spec.body else None,
+            auth_token=getattr(self, f"{spec.auth}_token") if spec.auth else None,
+            raw_body=spec.raw_body,
+        )
+        success = success and spec.check(data)
+
+        if success:
+            if spec.capture:
+                spec.capture(self, data)
+            self.log_test(spec.name, True, spec.detail(data) if spec.detail else "")
+        else:
+            self.log_test(spec.name, False, f"Status: {status}, Response: {data}")
+
+        return success
+
+    async def test_bootstrap(self):
+        """Seed the database and register both test users in one batch call"""
+        import random
+        random_id = random.randint(1000, 9999)
+        self.student_email = f"emma.watson{random_id}@student.com"
+        self.teacher_email = f"john.smith{random_id}@teacher.com"
+        payload = {
+            "seed": True,
+            "users": [
+                {
+                    "email": self.student_email,
+                    "password": "SecurePass123!",
+                    "full_name": "Emma Watson",
+                    "role": "student"
+                },
+                {
+                    "email": self.teacher_email,
+                    "password": "TeacherPass456!",
+                    "full_name": "John Smith",
+                    "role": "teacher"
+                }
+            ]
+        }
+
+        success, data, status = await self.make_request("POST", "/test/bootstrap", payload)
+
+        if success and "tokens" in data:
+            self.student_token = data["tokens"].get("student")
+            self.teacher_token = data["tokens"].get("teacher")
+            self.student_id = data["ids"].get("student")
+            self.teacher_id = data["ids"].get("teacher")
+            self.log_test("Batch Bootstrap", True, "Seeded and registered both users in one call")
+        else:
+            self.log_test("Batch Bootstrap", False, f"Status: {status}, Response: {data}")
+
+        return success
+
+    async def test_seed_data(self):
         """Seed database with sample data"""
         print("🌱 Seeding database with sample data...")
-        success, data, status = self.make_request("POST", "/seed-data")
+        success, data, status = await self.make_request("POST", "/seed-data")
         self.log_test("Database Seeding", success, f"Status: {status}")
         return success
 
-    def test_auth_register_student(self):
+    async def test_auth_register_student(self):
         """Test student registration"""
         import random
         random_id = random.randint(1000, 9999)
@@ -88,7 +402,7 @@ class NovaZoneAPITester:
             "role": "student"
         }
         
-        success, data, status = self.make_request("POST", "/auth/register", student_data)
+        success, data, status = await self.make_request("POST", "/auth/register", student_data)
         
         if success and "access_token" in data:
             self.student_token = data["access_token"]
@@ -99,7 +413,7 @@ class NovaZoneAPITester:
             
         return success
 
-    def test_auth_register_teacher(self):
+    async def test_auth_register_teacher(self):
         """Test teacher registration"""
         import random
         random_id = random.randint(1000, 9999)
@@ -111,7 +425,7 @@ class NovaZoneAPITester:
             "role": "teacher"
         }
         
-        success, data, status = self.make_request("POST", "/auth/register", teacher_data)
+        success, data, status = await self.make_request("POST", "/auth/register", teacher_data)
         
         if success and "access_token" in data:
             self.teacher_token = data["access_token"]
@@ -122,7 +436,7 @@ class NovaZoneAPITester:
             
         return success
 
-    def test_auth_login(self):
+    async def test_auth_login(self):
         """Test login with valid credentials"""
         # Use the same email from registration
         if not hasattr(self, 'student_email'):
@@ -134,7 +448,7 @@ class NovaZoneAPITester:
             "password": "SecurePass123!"
         }
         
-        success, data, status = self.make_request("POST", "/auth/login", login_data)
+        success, data, status = await self.make_request("POST", "/auth/login", login_data)
         
         if success and "access_token" in data:
             self.log_test("Student Login", True, f"Login successful")
@@ -143,7 +457,7 @@ class NovaZoneAPITester:
             
         return success
 
-    def test_auth_login_invalid(self):
+    async def test_auth_login_invalid(self):
         """Test login with invalid credentials"""
         if not hasattr(self, 'student_email'):
             self.log_test("Invalid Login (Expected Failure)", False, "No student email available")
@@ -154,7 +468,7 @@ class NovaZoneAPITester:
             "password": "WrongPassword"
         }
         
-        success, data, status = self.make_request("POST", "/auth/login", login_data)
+        success, data, status = await self.make_request("POST", "/auth/login", login_data)
         
         # Should fail with 401
         if not success and status == 401:
@@ -164,14 +478,14 @@ class NovaZoneAPITester:
             
         return not success and status == 401
 
-    def test_auth_login_invalid(self):
+    async def test_auth_login_invalid(self):
         """Test login with invalid credentials"""
         login_data = {
             "email": "emma.watson@student.com",
             "password": "WrongPassword"
         }
         
-        success, data, status = self.make_request("POST", "/auth/login", login_data)
+        success, data, status = await self.make_request("POST", "/auth/login", login_data)
         
         # Should fail with 401
         if not success and status == 401:
@@ -181,204 +495,28 @@ class NovaZoneAPITester:
             
         return not success and status == 401
 
-    def test_auth_me(self):
-        """Test protected route with valid token"""
-        if not self.student_token:
-            self.log_test("Get Current User", False, "No student token available")
-            return False
-            
-        success, data, status = self.make_request("GET", "/auth/me", auth_token=self.student_token)
-        
-        if success and "id" in data:
-            self.log_test("Get Current User", True, f"User data retrieved: {data['full_name']}")
-        else:
-            self.log_test("Get Current User", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_dashboard_student(self):
-        """Test student dashboard data"""
-        if not self.student_id:
-            self.log_test("Student Dashboard", False, "No student ID available")
-            return False
-            
-        success, data, status = self.make_request("GET", f"/dashboard/student/{self.student_id}")
-        
-        if success and "learning_path" in data:
-            self.log_test("Student Dashboard", True, f"Dashboard data includes learning path, courses, progress")
-        else:
-            self.log_test("Student Dashboard", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_dashboard_teacher(self):
-        """Test teacher dashboard data"""
-        if not self.teacher_id:
-            self.log_test("Teacher Dashboard", False, "No teacher ID available")
-            return False
-            
-        success, data, status = self.make_request("GET", f"/dashboard/teacher/{self.teacher_id}")
-        
-        if success and "analytics" in data:
-            self.log_test("Teacher Dashboard", True, f"Dashboard includes analytics and courses")
-        else:
-            self.log_test("Teacher Dashboard", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_courses_list(self):
-        """Test course listing"""
-        success, data, status = self.make_request("GET", "/courses")
-        
-        if success and isinstance(data, list):
-            self.log_test("Course Listing", True, f"Retrieved {len(data)} courses")
-        else:
-            self.log_test("Course Listing", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_courses_filter(self):
-        """Test course listing with filters"""
-        success, data, status = self.make_request("GET", "/courses?subject=Programming&difficulty=beginner")
-        
-        if success and isinstance(data, list):
-            self.log_test("Course Filtering", True, f"Filtered courses retrieved")
-        else:
-            self.log_test("Course Filtering", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_course_create(self):
-        """Test course creation (teacher only)"""
-        if not self.teacher_token:
-            self.log_test("Course Creation", False, "No teacher token available")
-            return False
-            
-        course_data = {
-            "title": "Advanced JavaScript Concepts",
-            "description": "Deep dive into modern JavaScript features and patterns",
-            "subject": "Programming",
-            "difficulty_level": "advanced",
-            "duration_hours": 35,
-            "total_lessons": 15
-        }
-        
-        success, data, status = self.make_request("POST", "/courses", course_data, auth_token=self.teacher_token)
-        
-        if success and "id" in data:
-            self.course_id = data["id"]
-            self.log_test("Course Creation", True, f"Course created with ID: {self.course_id}")
-        else:
-            self.log_test("Course Creation", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_course_enroll(self):
-        """Test course enrollment"""
-        if not self.student_token or not self.course_id:
-            self.log_test("Course Enrollment", False, "Missing student token or course ID")
-            return False
-            
-        success, data, status = self.make_request("POST", f"/courses/{self.course_id}/enroll", auth_token=self.student_token)
-        
-        if success and "message" in data:
-            self.log_test("Course Enrollment", True, "Successfully enrolled in course")
-        else:
-            self.log_test("Course Enrollment", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_teachers_list(self):
-        """Test teacher listing"""
-        success, data, status = self.make_request("GET", "/teachers")
-        
-        if success and isinstance(data, list):
-            self.log_test("Teacher Listing", True, f"Retrieved {len(data)} teachers")
-        else:
-            self.log_test("Teacher Listing", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_teachers_filter(self):
-        """Test teacher listing with subject filtering"""
-        success, data, status = self.make_request("GET", "/teachers?subject=Programming")
-        
-        if success and isinstance(data, list):
-            self.log_test("Teacher Subject Filtering", True, f"Filtered teachers retrieved")
-        else:
-            self.log_test("Teacher Subject Filtering", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_teacher_recommendations(self):
-        """Test AI teacher recommendations"""
-        if not self.student_token:
-            self.log_test("Teacher Recommendations", False, "No student token available")
-            return False
-            
-        success, data, status = self.make_request("GET", "/teachers/recommendations/Programming", auth_token=self.student_token)
-        
-        if success and "recommendations" in data:
-            self.log_test("Teacher Recommendations", True, f"AI recommendations retrieved")
-        else:
-            self.log_test("Teacher Recommendations", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_teacher_profile_update(self):
-        """Test teacher profile updates"""
-        if not self.teacher_token:
-            self.log_test("Teacher Profile Update", False, "No teacher token available")
-            return False
-            
-        profile_data = {
-            "subjects": ["Programming", "Web Development", "JavaScript"],
-            "experience_years": 8,
-            "bio": "Experienced full-stack developer and educator",
-            "hourly_rate": 65.0
-        }
-        
-        success, data, status = self.make_request("PUT", "/teachers/profile", profile_data, auth_token=self.teacher_token)
-        
-        if success and "message" in data:
-            self.log_test("Teacher Profile Update", True, "Profile updated successfully")
-        else:
-            self.log_test("Teacher Profile Update", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_progress_get(self):
-        """Test student progress data"""
-        if not self.student_id:
-            self.log_test("Get Student Progress", False, "No student ID available")
-            return False
-            
-        success, data, status = self.make_request("GET", f"/progress/{self.student_id}")
-        
-        if success and "stats" in data:
-            self.log_test("Get Student Progress", True, f"Progress data with AI analysis retrieved")
-        else:
-            self.log_test("Get Student Progress", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_progress_update(self):
+    async def test_progress_update(self):
         """Test progress updates"""
         # First, get progress to find a progress_id
         if not self.student_id:
             self.log_test("Update Progress", False, "No student ID available")
             return False
             
-        # Get progress first
-        success, data, status = self.make_request("GET", f"/progress/{self.student_id}")
-        if success and data.get("courses") and len(data["courses"]) > 0:
+        # Reuse the cached progress payload when it's fresh and has records;
+        # re-GET if it's missing, invalidated (e.g. by enrollment), or empty
+        data = self._progress_cache
+        if not data or not data.get("courses"):
+            success, data, status = await self.make_request("GET", f"/progress/{self.student_id}")
+            if not success:
+                data = {}
+        if data.get("courses") and len(data["courses"]) > 0:
             self.progress_id = data["courses"][0]["id"]
         else:
             self.log_test("Update Progress", False, "No progress records found to update")
             return False
             
         # Update progress
-        success, data, status = self.make_request("PUT", f"/progress/{self.progress_id}?completion_percentage=75.5&time_spent_hours=12.5")
+        success, data, status = await self.make_request("PUT", f"/progress/{self.progress_id}?completion_percentage=75.5&time_spent_hours=12.5")
         
         if success and "message" in data:
             self.log_test("Update Progress", True, "Progress updated successfully")
@@ -387,96 +525,21 @@ class NovaZoneAPITester:
             
         return success
 
-    def test_quiz_get(self):
-        """Test quiz retrieval/generation"""
-        if not self.course_id:
-            # Use a sample course ID from seeded data
-            self.course_id = "course_1"
-            
-        success, data, status = self.make_request("GET", f"/quiz/{self.course_id}")
-        
-        if success and "questions" in data:
-            self.quiz_id = data["id"]
-            self.log_test("Quiz Retrieval", True, f"Quiz with {len(data['questions'])} questions retrieved")
-        else:
-            self.log_test("Quiz Retrieval", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_quiz_submit(self):
-        """Test quiz submission and scoring"""
-        if not self.quiz_id or not self.student_token:
-            self.log_test("Quiz Submission", False, "Missing quiz ID or student token")
-            return False
-            
-        submission_data = {
-            "quiz_id": self.quiz_id,
-            "answers": [1, 2]  # Sample answers
-        }
-        
-        success, data, status = self.make_request("POST", "/quiz/submit", submission_data, auth_token=self.student_token)
-        
-        if success and "score" in data:
-            self.log_test("Quiz Submission", True, f"Quiz scored: {data['score']}%")
-        else:
-            self.log_test("Quiz Submission", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_community_posts_list(self):
-        """Test community post listing"""
-        success, data, status = self.make_request("GET", "/community/posts")
-        
-        if success and isinstance(data, list):
-            self.log_test("Community Posts Listing", True, f"Retrieved {len(data)} posts")
-        else:
-            self.log_test("Community Posts Listing", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_community_posts_filter(self):
-        """Test community post listing with category filter"""
-        success, data, status = self.make_request("GET", "/community/posts?category=question")
-        
-        if success and isinstance(data, list):
-            self.log_test("Community Posts Filtering", True, f"Filtered posts retrieved")
-        else:
-            self.log_test("Community Posts Filtering", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_community_post_create(self):
-        """Test post creation"""
-        if not self.student_token:
-            self.log_test("Community Post Creation", False, "No student token available")
-            return False
-            
-        post_data = {
-            "title": "How to improve coding skills?",
-            "content": "I'm looking for advice on how to become a better programmer. Any tips?",
-            "category": "question"
-        }
-        
-        success, data, status = self.make_request("POST", "/community/posts", post_data, auth_token=self.student_token)
-        
-        if success and "id" in data:
-            self.post_id = data["id"]
-            self.log_test("Community Post Creation", True, f"Post created with ID: {self.post_id}")
-        else:
-            self.log_test("Community Post Creation", False, f"Status: {status}, Response: {data}")
-            
-        return success
-
-    def test_file_upload(self):
+    async def test_file_upload(self):
         """Test file upload"""
-        # Create a simple test file
-        test_content = "This is a test file for NovaZone platform"
-        
+        # Hand httpx a file-like object so the multipart body is streamed in
+        # chunks instead of assembled in memory — stays O(chunk) however big
+        # the fixture grows
+        test_content = b"This is a test file for NovaZone platform"
+        # Remember what went up so the download test can verify the stream
+        self._upload_sha256 = hashlib.sha256(test_content).hexdigest()
+        self._upload_size = len(test_content)
+
         files = {
-            'file': ('test_document.txt', test_content, 'text/plain')
+            'file': ('test_document.txt', io.BytesIO(test_content), 'text/plain')
         }
-        
-        success, data, status = self.make_request("POST", "/upload", files=files)
+
+        success, data, status = await self.make_request("POST", "/upload", files=files)
         
         if success and "file_id" in data:
             self.file_id = data["file_id"]
@@ -486,65 +549,81 @@ class NovaZoneAPITester:
             
         return success
 
-    def test_file_download(self):
-        """Test file download"""
+    async def test_file_download(self, legacy_b64: bool = False):
+        """Test file download (streamed; hashes chunks instead of buffering)"""
         if not self.file_id:
             self.log_test("File Download", False, "No file ID available")
             return False
-            
-        success, data, status = self.make_request("GET", f"/files/{self.file_id}")
-        
-        if success and "content" in data:
-            self.log_test("File Download", True, f"File downloaded: {data['filename']}")
+
+        if legacy_b64:
+            # Back-compat with backends that base64-wrap the file in JSON
+            success, data, status = await self.make_request("GET", f"/files/{self.file_id}")
+            success = success and "content" in data
+            if success:
+                self.log_test("File Download", True, f"File downloaded: {data['filename']}")
+            else:
+                self.log_test("File Download", False, f"Status: {status}, Response: {data}")
+            return success
+
+        # The endpoint streams application/octet-stream — consume it in
+        # 64 KiB chunks and verify with a running hash, so peak memory stays
+        # O(chunk) regardless of file size
+        url = f"{self.base_url}/files/{self.file_id}"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            async with self.client.stream("GET", url, headers=self.headers) as response:
+                status = response.status_code
+                async for chunk in response.aiter_bytes(65536):
+                    digest.update(chunk)
+                    size += len(chunk)
+        except httpx.HTTPError as e:
+            self.log_test("File Download", False, f"Error: {str(e)}")
+            return False
+
+        success = status < 400 and size > 0
+        if self._upload_sha256 is not None:
+            success = success and size == self._upload_size and digest.hexdigest() == self._upload_sha256
+
+        if success:
+            self.log_test("File Download", True, f"Streamed {size} bytes, sha256 verified")
         else:
-            self.log_test("File Download", False, f"Status: {status}, Response: {data}")
-            
+            self.log_test("File Download", False, f"Status: {status}, size: {size}, sha256: {digest.hexdigest()}")
+
         return success
 
-    def test_role_based_access(self):
-        """Test role-based access control"""
+    async def test_role_based_access(self):
+        """Test role-based access control (every forbidden path must 403)"""
         print("🔐 Testing Role-Based Access Control...")
-        
-        # Test student trying to create course (should fail)
-        if self.student_token:
-            course_data = {
-                "title": "Unauthorized Course",
-                "description": "This should fail",
-                "subject": "Test",
-                "difficulty_level": "beginner",
-                "duration_hours": 10,
-                "total_lessons": 5
-            }
-            
-            success, data, status = self.make_request("POST", "/courses", course_data, auth_token=self.student_token)
-            
-            if not success and status == 403:
-                self.log_test("Student Course Creation (Expected Failure)", True, "Correctly blocked student from creating course")
-            else:
-                self.log_test("Student Course Creation (Expected Failure)", False, f"Should have failed with 403, got {status}")
-        
-        # Test student trying to update teacher profile (should fail)
-        if self.student_token:
-            profile_data = {
-                "subjects": ["Hacking"],
-                "experience_years": 1,
-                "bio": "Unauthorized access"
-            }
-            
-            success, data, status = self.make_request("PUT", "/teachers/profile", profile_data, auth_token=self.student_token)
-            
-            if not success and status == 403:
-                self.log_test("Student Teacher Profile Update (Expected Failure)", True, "Correctly blocked student from updating teacher profile")
-            else:
-                self.log_test("Student Teacher Profile Update (Expected Failure)", False, f"Should have failed with 403, got {status}")
+        if not self.student_token:
+            self.log_test("Role-Based Access Control", False, "No student token available")
+            return False
 
-    def test_ai_placeholder_functions(self):
+        # Fan out the whole negative matrix — the assertions are independent,
+        # so the cohort costs max(RTT) instead of one round trip per row
+        results = await asyncio.gather(*(
+            self.make_request(method, path, auth_token=self.student_token, raw_body=body)
+            for method, path, body in FORBIDDEN_MATRIX
+        ))
+
+        rejected = all(status == 403 for _, _, status in results)
+        if rejected:
+            self.log_test("Role-Based Access Control", True,
+                          f"All {len(FORBIDDEN_MATRIX)} forbidden paths correctly rejected with 403")
+        else:
+            outcomes = [f"{m} {p} -> {s}"
+                        for (m, p, _), (_, _, s) in zip(FORBIDDEN_MATRIX, results)]
+            self.log_test("Role-Based Access Control", False, "; ".join(outcomes))
+
+        return rejected
+
+    async def test_ai_placeholder_functions(self):
         """Test AI placeholder functions return proper mock data"""
         print("🤖 Testing AI Placeholder Functions...")
         
         # Test learning path (via student dashboard)
         if self.student_id:
-            success, data, status = self.make_request("GET", f"/dashboard/student/{self.student_id}")
+            success, data, status = await self.make_request("GET", f"/dashboard/student/{self.student_id}")
             if success and "learning_path" in data and "ai_insights" in data:
                 learning_path = data["learning_path"]
                 ai_insights = data["ai_insights"]
@@ -569,7 +648,7 @@ class NovaZoneAPITester:
         
         # Test teacher recommendations
         if self.student_token:
-            success, data, status = self.make_request("GET", "/teachers/recommendations/Programming", auth_token=self.student_token)
+            success, data, status = await self.make_request("GET", "/teachers/recommendations/Programming", auth_token=self.student_token)
             if success and "recommendations" in data:
                 recommendations = data["recommendations"]
                 if len(recommendations) > 0 and "match_score" in recommendations[0]:
@@ -579,79 +658,76 @@ class NovaZoneAPITester:
             else:
                 self.log_test("AI Teacher Recommendations", False, f"Status: {status}")
 
-    def run_all_tests(self):
-        """Run comprehensive test suite"""
+    async def run_all_tests(self, full: bool = False):
+        """Run comprehensive test suite.
+
+        By default setup happens via the batch /test/bootstrap endpoint (one
+        round-trip); pass full=True (--full on the CLI) to exercise the
+        individual seed/register endpoints as well.
+        """
         print("🚀 Starting NovaZone Backend API Testing")
         print("=" * 60)
-        
-        # Initialize with sample data
-        self.test_seed_data()
-        
+
         # Authentication Tests
         print("🔐 AUTHENTICATION TESTS")
         print("-" * 30)
-        self.test_auth_register_student()
-        self.test_auth_register_teacher()
-        self.test_auth_login()
-        self.test_auth_login_invalid()
-        self.test_auth_me()
-        
-        # Dashboard Tests
-        print("📊 DASHBOARD TESTS")
-        print("-" * 30)
-        self.test_dashboard_student()
-        self.test_dashboard_teacher()
-        
-        # Course Tests
-        print("📚 COURSE TESTS")
+        if full:
+            await self.test_seed_data()
+            # The two registrations share no state — overlap them so auth
+            # setup costs one round trip instead of two
+            await asyncio.gather(
+                self.test_auth_register_student(),
+                self.test_auth_register_teacher(),
+            )
+        else:
+            await self.test_bootstrap()
+        # Both login checks depend only on registration, not on each other
+        await asyncio.gather(
+            self.test_auth_login(),
+            self.test_auth_login_invalid(),
+        )
+
+        # Read-only specs with no data dependency on each other — fan them
+        # out so the cohort's wall time is max(RTT) instead of sum(RTT)
+        print("📊 READ-ONLY TESTS (parallel)")
         print("-" * 30)
-        self.test_courses_list()
-        self.test_courses_filter()
-        self.test_course_create()
-        self.test_course_enroll()
-        
-        # Teacher Tests
-        print("👨‍🏫 TEACHER TESTS")
+        await asyncio.gather(*(self._run_spec(spec) for spec in INDEP_READS))
+
+        # Write-path specs (ordered: create -> enroll, etc.)
+        print("📚 COURSE & TEACHER TESTS")
         print("-" * 30)
-        self.test_teachers_list()
-        self.test_teachers_filter()
-        self.test_teacher_recommendations()
-        self.test_teacher_profile_update()
-        
+        for spec in SEQ_CREATES:
+            await self._run_spec(spec)
+
         # Progress Tests
         print("📈 PROGRESS TESTS")
         print("-" * 30)
-        self.test_progress_get()
-        self.test_progress_update()
-        
-        # Quiz Tests
-        print("❓ QUIZ TESTS")
-        print("-" * 30)
-        self.test_quiz_get()
-        self.test_quiz_submit()
-        
-        # Community Tests
-        print("💬 COMMUNITY TESTS")
+        await self.test_progress_update()
+
+        # Quiz & Community Tests
+        print("❓ QUIZ & COMMUNITY TESTS")
         print("-" * 30)
-        self.test_community_posts_list()
-        self.test_community_posts_filter()
-        self.test_community_post_create()
-        
+        for spec in SEQ_QUIZ_COMMUNITY:
+            await self._run_spec(spec)
+
         # File Tests
         print("📁 FILE TESTS")
         print("-" * 30)
-        self.test_file_upload()
-        self.test_file_download()
+        await self.test_file_upload()
+        await self.test_file_download()
         
         # Security Tests
-        self.test_role_based_access()
+        await self.test_role_based_access()
         
         # AI Tests
-        self.test_ai_placeholder_functions()
+        await self.test_ai_placeholder_functions()
         
+        self.flush_logs()
         print("=" * 60)
         print("🏁 Testing Complete!")
 
+        await self.client.aclose()
+
 if __name__ == "__main__":
-    tester = NovaZoneAPITester()
-    tester.run_all_tests()
\ No newline at end of file
+    tester = NovaZoneAPITester(stream="--stream" in sys.argv)
+    asyncio.run(tester.run_all_tests(full="--full" in sys.argv))
\ No newline at end of file